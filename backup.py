@@ -0,0 +1,119 @@
+"""
+    Snapshot e restauração do banco de dados com a API de 'backup' online do SQLite.
+
+    Exemplo:
+        python backup.py snapshot database.bin.gz
+        python backup.py restore database.bin.gz
+"""
+import sqlite3
+import zlib
+from argparse import ArgumentParser
+from contextlib import closing
+from typing import AsyncIterable, Iterator
+
+BACKUP_BUSY_RETRY = 0.05
+BACKUP_CHUNK_SIZE = 64 * 1024
+
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+REQUIRED_TABLES = {'user', 'task'}
+
+
+def snapshot_database(source: str, target: str, busy_retry: float = BACKUP_BUSY_RETRY):
+    """
+        Copia <source> para <target> num único passo da API de 'backup', ou seja, dentro de uma só transação de
+    leitura. O banco de dados da API roda em modo WAL, então essa leitura não bloqueia as escritas, e a cópia
+    reflete o estado do início da transação. Em passos menores o SQLite recomeçaria a cópia a cada escrita de
+    outra conexão, e com a API escrevendo ela nunca terminaria. Deve rodar fora do 'event loop'
+    (ex.: <asyncio.to_thread>).
+
+    :param busy_retry: Espera, em segundos, antes de tentar de novo quando o banco de dados está ocupado.
+    """
+    with closing(sqlite3.connect(source)) as src, closing(sqlite3.connect(target)) as dst:
+        src.backup(dst, pages=-1, sleep=busy_retry)
+
+
+def restore_database(snapshot: str, target: str, busy_retry: float = BACKUP_BUSY_RETRY):
+    """
+        Sobrescreve <target> com o conteúdo de <snapshot>. O 'snapshot' é verificado antes, para não substituir o
+    banco de dados por um arquivo corrompido ou sem as tabelas da API (um arquivo vazio passa no 'quick_check').
+
+        A API de 'backup' mantém o 'lock' exclusivo de <target> durante toda a restauração, então as escritas da API
+    ficam bloqueadas até ela terminar.
+    """
+    with closing(sqlite3.connect(snapshot)) as src:
+        try:
+            result = src.execute('PRAGMA quick_check').fetchone()[0]
+            tables = {row[0] for row in src.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f'Invalid snapshot: {e}')
+
+        if result != 'ok':
+            raise ValueError(f'Invalid snapshot: {result}')
+
+        if missing := REQUIRED_TABLES - tables:
+            raise ValueError(f'Invalid snapshot: missing tables {", ".join(sorted(missing))}.')
+
+        with closing(sqlite3.connect(target)) as dst:
+            src.backup(dst, pages=-1, sleep=busy_retry)
+
+
+def iter_gzip(path: str, chunk_size: int = BACKUP_CHUNK_SIZE) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=GZIP_WBITS)
+
+    with open(path, 'rb') as file:
+        while chunk := file.read(chunk_size):
+            if data := compressor.compress(chunk):
+                yield data
+
+    yield compressor.flush()
+
+
+async def write_gunzip(chunks: AsyncIterable[bytes], path: str):
+    decompressor = zlib.decompressobj(wbits=GZIP_WBITS)
+
+    with open(path, 'wb') as file:
+        try:
+            async for chunk in chunks:
+                file.write(decompressor.decompress(chunk))
+
+            file.write(decompressor.flush())
+
+        except zlib.error as e:
+            raise ValueError(f'Invalid snapshot: {e}')
+
+    if not decompressor.eof:
+        raise ValueError('Invalid snapshot: truncated gzip stream.')
+
+
+if __name__ == '__main__':
+    import gzip
+    import os
+    from shutil import copyfileobj
+    from tempfile import mkstemp
+
+    parser = ArgumentParser(description='Take or restore a compressed snapshot of the database.')
+    parser.add_argument('command', choices=['snapshot', 'restore'])
+    parser.add_argument('file', help='Compressed snapshot (.gz) to write or read.')
+    parser.add_argument('--db', default='database.bin')
+    args = parser.parse_args()
+
+    fd, temp = mkstemp(suffix='.bin')
+    os.close(fd)
+
+    try:
+        if args.command == 'snapshot':
+            snapshot_database(args.db, temp)
+
+            with open(args.file, 'wb') as output:
+                for data in iter_gzip(temp):
+                    output.write(data)
+
+        else:
+            with gzip.open(args.file, 'rb') as compressed, open(temp, 'wb') as output:
+                copyfileobj(compressed, output, BACKUP_CHUNK_SIZE)
+
+            restore_database(temp, args.db)
+
+    finally:
+        os.remove(temp)
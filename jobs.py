@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from utils import *
+from models import *
+
+JOB_WORKERS = 2
+
+log = logging.getLogger(__name__)
+
+Report = Callable[[int, int], Awaitable[None]]
+JobHandler = Callable[..., Awaitable[str]]
+
+_handlers: dict[str, JobHandler] = dict()
+
+
+def job_handler(kind: str):
+    """
+        Registra uma função assíncrona como executora dos 'jobs' do tipo <kind>. A função recebe <report>, usado
+    para reportar o progresso, e os parâmetros passados em <JobQueue.submit>. O texto retornado é salvo em
+    <Job.detail>.
+    """
+    def decorator(func: JobHandler) -> JobHandler:
+        _handlers[kind] = func
+        return func
+
+    return decorator
+
+
+def serialize_job(job: Job) -> dict:
+    return {
+        'reference': job.reference,
+        'kind': job.kind,
+        'status': job.status.value,
+        'progress': job.progress,
+        'total': job.total,
+        'detail': job.detail,
+        'created_at': job.created_at.isoformat(),
+        'updated_at': job.updated_at.isoformat()
+    }
+
+
+class JobQueue:
+    """
+        Fila de 'jobs' em processo, executada por um número fixo de 'workers' assíncronos. Isso limita quantas
+    operações pesadas rodam ao mesmo tempo. Os 'workers' são iniciados na primeira submissão.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS):
+        self.workers = workers
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = list()
+
+    async def submit(self, kind: str, user: User = None, **params) -> Job:
+        if kind not in _handlers:
+            raise ValueError(f'Unknown job kind <kind={kind}>.')
+
+        job = await Job.create(reference=str(uuid4()), kind=kind, user=user)
+
+        self._ensure_workers()
+        await self._queue.put((job.id, kind, params))
+
+        return job
+
+    async def shutdown(self):
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        self._tasks = list()
+        self._queue = None
+
+    def _ensure_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+
+        self._tasks = [task for task in self._tasks if not task.done()]
+
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    async def _worker(self):
+        while True:
+            job_id, kind, params = await self._queue.get()
+
+            try:
+                await self._run(job_id, kind, params)
+
+            except Exception as e:
+                log.exception('Job <job_id=%s, kind=%s> failed outside its handler.', job_id, kind)
+                await self._mark_failed(job_id, e)
+
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    async def _mark_failed(job_id: int, error: Exception):
+        try:
+            await Job.filter(id=job_id).update(status=JobStatusEnum.FAILED, detail=f'Job error detail: {error}')
+
+        except Exception:
+            log.exception('Could not mark job <job_id=%s> as failed.', job_id)
+
+    @staticmethod
+    async def _run(job_id: int, kind: str, params: dict):
+        job = await Job.get(id=job_id)
+        job.status = JobStatusEnum.RUNNING
+        await job.save()
+
+        async def report(progress: int, total: int = None):
+            job.progress = progress
+
+            if total is not None:
+                job.total = total
+
+            await job.save(update_fields=['progress', 'total', 'updated_at'])
+
+        try:
+            job.detail = await _handlers[kind](report=report, **params)
+            job.status = JobStatusEnum.COMPLETED
+
+        except Exception as e:
+            job.detail = f'Job error detail: {e}'
+            job.status = JobStatusEnum.FAILED
+
+        await job.save()
+
+
+async def fail_interrupted_jobs():
+    """
+        Os parâmetros dos 'jobs' vivem só em memória, então os que ficaram pendentes numa reinicialização do servidor
+    não podem ser retomados. Eles são marcados como falhos.
+    """
+    await Job.filter(status__in=[JobStatusEnum.QUEUED, JobStatusEnum.RUNNING]).update(
+        status=JobStatusEnum.FAILED,
+        detail='Job interrupted by a server restart.'
+    )
+
+
+@job_handler('task.clear')
+async def clear_tasks_job(report: Report, user_reference: str) -> str:
+    user = await User.get(reference=user_reference)
+    total = await Task.filter(user=user).count()
+
+    await report(0, total)
+    deleted = await delete_tasks_in_chunks(user, on_chunk=lambda count: report(count, total))
+
+    return f'{deleted} tasks deleted.'
+
+
+job_queue = JobQueue()
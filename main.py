@@ -1,14 +1,20 @@
+import asyncio
+import os
+from tempfile import mkstemp
 from uuid import uuid4
 
 from utils import *
 from schamas import *
 from models import *
+from jobs import job_queue, serialize_job, fail_interrupted_jobs
+from backup import snapshot_database, restore_database, iter_gzip, write_gunzip
 
 # noinspection PyUnresolvedReferences
 from pydantic import constr
-from starlette.responses import JSONResponse,  Response
+from starlette.responses import JSONResponse,  Response, StreamingResponse
 from starlette.exceptions import HTTPException
-from fastapi import FastAPI
+from starlette.background import BackgroundTask
+from fastapi import FastAPI, Header, Request
 from tortoise.contrib.fastapi import register_tortoise
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
@@ -18,11 +24,21 @@ app = FastAPI()
 register_tortoise(
     app=app,
     modules={'models': ['models']},
-    db_url='sqlite://database.bin',
+    db_url='sqlite://database.bin?journal_mode=WAL',
     generate_schemas=True,
 )
 
 
+@app.on_event('startup')
+async def startup_jobs():
+    await fail_interrupted_jobs()
+
+
+@app.on_event('shutdown')
+async def shutdown_jobs():
+    await job_queue.shutdown()
+
+
 @app.post('/user/register')
 async def register_user(data: UserRegisterSchema):
     """
@@ -236,7 +252,7 @@ async def list_tasks(user_reference: str):
                 'reference': task.reference,
                 'task': task.task,
                 'description': task.description,
-                'status': task.status
+                'status': task.status.value
             })
 
         return JSONResponse(response)
@@ -341,13 +357,15 @@ async def update_task(data: UpdateTaskSchema):
 @app.delete('/task/clear/{user}')
 async def clear_all_tasks(user: constr(max_length=36)):
     """
-            Limpa todas as tarefas de um usuário.
+            Limpa todas as tarefas de um usuário. A limpeza roda como um 'job' em segundo plano, em lotes, para não
+        segurar a requisição nem o 'lock' de escrita do banco de dados durante toda a remoção.
 
     :param user: Referencia de usuário.
 
     :return: Os retornos são correspondentes a consistência dos dados recebidos. Possíveis respostas válidas:
-        Para 'status code' == 200:
-            Tudo foi limpo para esse usuário
+        Para 'status code' == 202:
+                A limpeza foi agendada. Será retornado um JSON com a referência do 'job', que pode ser acompanhado
+            em /jobs/<referência do job>.
 
         Para 'statusCode' == 404:
             Nenhum usuário correspondente a <user_reference> foi encontrado.
@@ -364,15 +382,170 @@ async def clear_all_tasks(user: constr(max_length=36)):
     await user_not_found_exception(user)
 
     try:
-        user = await User.get(reference=user)
-        await Task.filter(user=user).all().delete()
+        user_model = await User.get(reference=user)
+        job = await job_queue.submit('task.clear', user=user_model, user_reference=user)
 
-        return Response(status_code=200, content=f'All tasks for <user_reference={user}> have been deleted!')
+        return JSONResponse({
+            'details': f'Deletion of all tasks for <user_reference={user}> has been scheduled.',
+            'job': job.reference
+        }, status_code=202)
 
     except Exception as e:
         raise HTTPException(500, f'Server Error detail: {e}')
 
 
+@app.get('/jobs/{reference}')
+async def get_job(reference: constr(max_length=36)):
+    """
+        Retorna o estado de um 'job' em segundo plano.
+
+    :param reference: Referência do 'job', retornada pela rota que o agendou.
+
+    :return: Os retornos são correspondentes a consistência dos dados recebidos. Possíveis respostas válidas:
+        Para 'statusCode' == 200:
+                Será retornado um JSON com 'status' ('queued', 'running', 'completed' ou 'failed'), 'progress',
+            'total' e 'detail' do 'job'.
+
+        Para 'statusCode' == 404:
+            Nenhum 'job' correspondente a <reference> foi encontrado.
+    """
+    job = await Job.get_or_none(reference=reference)
+
+    if not job:
+        raise HTTPException(404, f'Job with <job_reference={reference}> not found!')
+
+    return JSONResponse(serialize_job(job))
+
+
+@app.get('/jobs/list/{user_reference}')
+async def list_jobs(user_reference: constr(max_length=36)):
+    """
+        Retorna uma lista com todos os 'jobs' de um usuário, do mais recente ao mais antigo.
+
+    :param user_reference: Referência de usuário.
+
+    :return: Os retornos são correspondentes a consistência dos dados recebidos. Possíveis respostas válidas:
+        Para 'statusCode' == 200:
+            A lista foi retornada.
+
+        Para 'statusCode' == 404:
+            Nenhum usuário correspondente a <user_reference> foi encontrado.
+    """
+    await user_not_found_exception(user_reference)
+
+    jobs = await Job.filter(user__reference=user_reference).order_by('-id')
+
+    return JSONResponse([serialize_job(job) for job in jobs])
+
+
+def temporary_database_file() -> str:
+    fd, path = mkstemp(suffix='.bin')
+    os.close(fd)
+    return path
+
+
+@app.get('/admin/snapshot')
+async def database_snapshot(x_admin_token: str = Header(None)):
+    """
+        Retorna um 'snapshot' consistente do banco de dados, comprimido com gzip. A cópia é feita com a API de
+    'backup' online do SQLite numa transação de leitura, que em modo WAL não bloqueia as escritas da API.
+
+    :param x_admin_token: Cabeçalho 'X-Admin-Token', deve ser igual à variável de ambiente ADMIN_TOKEN.
+
+    :return: Os retornos são correspondentes a consistência dos dados recebidos. Possíveis respostas válidas:
+        Para 'statusCode' == 200:
+            O arquivo do 'snapshot' (application/gzip) é enviado em 'stream'.
+
+        Para 'statusCode' == 401:
+            Autorização negada. Token de administrador é inválido.
+
+        Para 'statusCode' == 403:
+            Rotas de administração desabilitadas, ADMIN_TOKEN não foi definido.
+
+        Para 'statusCode' == 409:
+            O banco de dados está em memória e não pode ser copiado.
+
+        Para 'statusCode' == 500:
+                Um erro interno no servidor foi invocádo, consulte o retorno JSON para mais detalhes e entre em contando
+            com o desenvolvedor para solucionar um problema. Esse status não pode ser retornado.
+    """
+    compare_admin_token(x_admin_token)
+
+    source = database_path()
+
+    if source == ':memory:':
+        raise HTTPException(409, 'An in-memory database cannot be snapshotted.')
+
+    snapshot = temporary_database_file()
+
+    try:
+        await asyncio.to_thread(snapshot_database, source, snapshot)
+
+    except Exception as e:
+        os.remove(snapshot)
+        raise HTTPException(500, f'Server Error detail: {e}')
+
+    return StreamingResponse(
+        iter_gzip(snapshot),
+        media_type='application/gzip',
+        headers={'Content-Disposition': 'attachment; filename="database.bin.gz"'},
+        background=BackgroundTask(os.remove, snapshot)
+    )
+
+
+@app.post('/admin/restore')
+async def database_restore(request: Request, x_admin_token: str = Header(None)):
+    """
+        Restaura o banco de dados a partir de um 'snapshot' gerado por /admin/snapshot. O corpo da requisição deve
+    ser o arquivo comprimido com gzip. As escritas da API ficam bloqueadas enquanto a restauração roda.
+
+    :param x_admin_token: Cabeçalho 'X-Admin-Token', deve ser igual à variável de ambiente ADMIN_TOKEN.
+
+    :return: Os retornos são correspondentes a consistência dos dados recebidos. Possíveis respostas válidas:
+        Para 'statusCode' == 200:
+            O banco de dados foi restaurado.
+
+        Para 'statusCode' == 401:
+            Autorização negada. Token de administrador é inválido.
+
+        Para 'statusCode' == 403:
+            Rotas de administração desabilitadas, ADMIN_TOKEN não foi definido.
+
+        Para 'statusCode' == 409:
+            O banco de dados está em memória e não pode ser restaurado.
+
+        Para 'statusCode' == 422:
+            O arquivo enviado não é um 'snapshot' válido.
+
+        Para 'statusCode' == 500:
+                Um erro interno no servidor foi invocádo, consulte o retorno JSON para mais detalhes e entre em contando
+            com o desenvolvedor para solucionar um problema. Esse status não pode ser retornado.
+    """
+    compare_admin_token(x_admin_token)
+
+    target = database_path()
+
+    if target == ':memory:':
+        raise HTTPException(409, 'An in-memory database cannot be restored.')
+
+    snapshot = temporary_database_file()
+
+    try:
+        await write_gunzip(request.stream(), snapshot)
+        await asyncio.to_thread(restore_database, snapshot, target)
+
+        return Response(status_code=200, content='Database has been restored.')
+
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+
+    except Exception as e:
+        raise HTTPException(500, f'Server Error detail: {e}')
+
+    finally:
+        os.remove(snapshot)
+
+
 if __name__ == '__main__':
     import uvicorn
     uvicorn.run('main:app', host='localhost', port=8080, log_level='info', lifespan='on')
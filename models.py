@@ -23,4 +23,24 @@ class Task(Model):
     reference = CharField(36, unique=True)
     description = CharField(255)
     status = CharEnumField(StatusEnum)
-    user = ForeignKeyField('models.User', related_name='tasks')
+    user = ForeignKeyField('models.User', related_name='tasks', index=True)
+
+
+class JobStatusEnum(Enum):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+
+
+class Job(Model):
+    id = IntField(pk=True)
+    reference = CharField(36, unique=True)
+    kind = CharField(55)
+    status = CharEnumField(JobStatusEnum, default=JobStatusEnum.QUEUED)
+    progress = IntField(default=0)
+    total = IntField(null=True)
+    detail = TextField(null=True)
+    user = ForeignKeyField('models.User', related_name='jobs', null=True, index=True)
+    created_at = DatetimeField(auto_now_add=True)
+    updated_at = DatetimeField(auto_now=True)
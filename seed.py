@@ -0,0 +1,96 @@
+"""
+    Gera usuários e tarefas em massa direto no banco de dados, para testar a API com volumes realistas.
+
+    Exemplo:
+        python seed.py --users 10000 --tasks-per-user 100 --db sqlite://database.bin
+"""
+from argparse import ArgumentParser
+from random import choice
+from time import perf_counter
+from uuid import uuid4
+
+from tortoise import Tortoise, run_async
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+from argon2 import PasswordHasher
+
+from models import *
+
+SEED_PASSWORD = 'seed'
+SEED_BATCH_SIZE = 10_000
+
+USER_INSERT = 'INSERT INTO "user" ("id", "username", "password", "current_access_token", "reference") ' \
+              'VALUES (?, ?, ?, ?, ?)'
+TASK_INSERT = 'INSERT INTO "task" ("task", "reference", "description", "status", "user_id") VALUES (?, ?, ?, ?, ?)'
+
+
+async def seed(
+        users: int,
+        tasks_per_user: int,
+        batch_size: int = SEED_BATCH_SIZE,
+        connection: BaseDBAsyncClient = None
+) -> tuple[int, int]:
+    """
+        Insere <users> usuários com <tasks_per_user> tarefas cada, usando 'executemany' em lotes de <batch_size>
+    linhas por transação. Todos os usuários compartilham a senha <SEED_PASSWORD>, já que gerar um 'hash' argon2 por
+    usuário tomaria a maior parte do tempo.
+
+    :return: Os 'ids' do primeiro e do último usuário criados.
+    """
+    connection = connection or Tortoise.get_connection('default')
+    password = PasswordHasher().hash(SEED_PASSWORD)
+    statuses = [status.value for status in StatusEnum]
+
+    last = await User.all().order_by('-id').using_db(connection).first()
+    first_id = (last.id if last else 0) + 1
+    last_id = first_id + users - 1
+
+    for start in range(first_id, last_id + 1, batch_size):
+        user_ids = range(start, min(start + batch_size, last_id + 1))
+
+        async with in_transaction(connection.connection_name) as conn:
+            await conn.execute_many(USER_INSERT, [
+                [user_id, f'seed_{user_id}', password, str(uuid4()), str(uuid4())] for user_id in user_ids
+            ])
+
+            rows = list()
+
+            for user_id in user_ids:
+                for index in range(tasks_per_user):
+                    rows.append([
+                        f'Seed task {user_id}-{index}',
+                        str(uuid4()),
+                        f'Generated task {index} of user {user_id}.',
+                        choice(statuses),
+                        user_id
+                    ])
+
+                    if len(rows) >= batch_size:
+                        await conn.execute_many(TASK_INSERT, rows)
+                        rows = list()
+
+            if rows:
+                await conn.execute_many(TASK_INSERT, rows)
+
+    return first_id, last_id
+
+
+async def main(db_url: str, users: int, tasks_per_user: int, batch_size: int):
+    await Tortoise.init(db_url=db_url, modules={'models': ['models']})
+    await Tortoise.generate_schemas()
+
+    start = perf_counter()
+    await seed(users, tasks_per_user, batch_size)
+
+    print(f'{users} users and {users * tasks_per_user} tasks created in {perf_counter() - start:.2f}s.')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Populate the database with generated users and tasks.')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--tasks-per-user', type=int, default=100)
+    parser.add_argument('--batch-size', type=int, default=SEED_BATCH_SIZE)
+    parser.add_argument('--db', default='sqlite://database.bin')
+    args = parser.parse_args()
+
+    run_async(main(args.db, args.users, args.tasks_per_user, args.batch_size))
@@ -0,0 +1,34 @@
+import asyncio
+
+from httpx import AsyncClient
+from tortoise import Tortoise
+
+
+async def cls_db():
+    """
+        Isso apaga todos os dados do banco de dados.
+
+        ATENÇÃO:
+            Isso é um 'workaround', feito para evitar problemas com conflito de dados. Mas não é uma solução aprovável.
+    """
+    models = Tortoise.apps.get('models')
+
+    for model_name, models_object in models.items():
+        if model_name == 'Aerich':
+            continue
+        await models_object.all().delete()
+
+
+async def wait_job(client: AsyncClient, reference: str, attempts: int = 100) -> dict:
+    """
+        Consulta /jobs/{reference} até o 'job' terminar.
+    """
+    for _ in range(attempts):
+        job = (await client.get(f'/jobs/{reference}')).json()
+
+        if job['status'] in ('completed', 'failed'):
+            return job
+
+        await asyncio.sleep(0.01)
+
+    raise TimeoutError(f'Job <job_reference={reference}> did not finish.')
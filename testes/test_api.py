@@ -1,22 +1,8 @@
 import pytest
 from httpx import AsyncClient
-from utils import get_test_data
-from tortoise import Tortoise
-
-
-async def cls_db():
-    """
-        Isso apaga todos os dados do banco de dados.
-
-        ATENÇÃO:
-            Isso é um 'workaround', feito para evitar problemas com conflito de dados. Mas não é uma solução aprovável.
-    """
-    models = Tortoise.apps.get('models')
-
-    for model_name, models_object in models.items():
-        if model_name == 'Aerich':
-            continue
-        await models_object.all().delete()
+from utils import get_test_data, delete_tasks_in_chunks
+from models import User, Task
+from testes.helpers import cls_db, wait_job
 
 
 # =============================================== Test of /user/register ===============================================
@@ -146,6 +132,32 @@ async def test_list_all_tasks_of_one_user_success(client: AsyncClient):
     assert response.status_code == 200
 
 
+# noinspection DuplicatedCode
+@pytest.mark.anyio
+async def test_list_tasks_returns_registered_tasks(client: AsyncClient):
+    await cls_db()
+
+    user = get_test_data('user_register')['jeff']
+    task = get_test_data('create_task')['task1']
+
+    user_register = await client.post('/user/register', json=user)
+
+    task['user_reference'] = user_register.json()['reference']
+    task['token'] = user_register.json()['token']
+
+    task_register = await client.post('/task/create', json=task)
+
+    response = await client.get(f'/task/list/{user_register.json()["reference"]}')
+
+    assert response.status_code == 200
+    assert response.json() == [{
+        'reference': task_register.json()['reference'],
+        'task': task['task'],
+        'description': task['description'],
+        'status': task['status']
+    }]
+
+
 # ======================================== Test of /task/delete/{user}/{task} ==========================================
 
 # noinspection DuplicatedCode
@@ -226,4 +238,63 @@ async def test_clear_all_tasks_of_a_user(client: AsyncClient):
 
     response = await client.delete(f'/task/clear/{user_register.json()["reference"]}')
 
+    assert response.status_code == 202
+
+    job = await wait_job(client, response.json()['job'])
+
+    assert job['status'] == 'completed'
+    assert job['progress'] == job['total'] == 2
+
+
+# noinspection DuplicatedCode
+@pytest.mark.anyio
+async def test_clear_tasks_in_chunks(client: AsyncClient):
+    await cls_db()
+
+    user = get_test_data('user_register')['jeff']
+    task = get_test_data('create_task')['task1']
+    task2 = get_test_data('create_task')['task2']
+
+    user_register = await client.post('/user/register', json=user)
+
+    task['user_reference'] = user_register.json()['reference']
+    task['token'] = user_register.json()['token']
+
+    task2['user_reference'] = user_register.json()['reference']
+    task2['token'] = user_register.json()['token']
+
+    await client.post('/task/create', json=task)
+    await client.post('/task/create', json=task2)
+
+    user = await User.get(reference=user_register.json()['reference'])
+    deleted = await delete_tasks_in_chunks(user, chunk_size=1, pause=0)
+
+    assert deleted == 2
+    assert not await Task.filter(user=user).exists()
+
+
+# ============================================= Test of /jobs/{reference} ==============================================
+
+@pytest.mark.anyio
+async def test_get_job_not_found_exception(client: AsyncClient):
+    response = await client.get('/jobs/bcee11a4-3686-4833-aac3-488772453f5a')
+
+    assert response.status_code == 404
+
+
+# noinspection DuplicatedCode
+@pytest.mark.anyio
+async def test_list_jobs_of_a_user(client: AsyncClient):
+    await cls_db()
+
+    user = get_test_data('user_register')['jeff']
+    user_register = await client.post('/user/register', json=user)
+    user_reference = user_register.json()['reference']
+
+    clear = await client.delete(f'/task/clear/{user_reference}')
+    await wait_job(client, clear.json()['job'])
+
+    response = await client.get(f'/jobs/list/{user_reference}')
+
     assert response.status_code == 200
+    assert [job['reference'] for job in response.json()] == [clear.json()['job']]
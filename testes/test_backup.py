@@ -0,0 +1,187 @@
+import gzip
+import sqlite3
+import threading
+from contextlib import closing
+from multiprocessing import Event, Process
+
+import pytest
+from httpx import AsyncClient
+
+import main
+from backup import snapshot_database, restore_database
+
+ADMIN_TOKEN = 'bcee11a4-3686-4833-aac3-488772453f5a'
+
+
+def create_database(path: str, rows: list[str]):
+    with closing(sqlite3.connect(path)) as conn:
+        conn.execute('CREATE TABLE IF NOT EXISTS user (id INTEGER PRIMARY KEY)')
+        conn.execute('CREATE TABLE IF NOT EXISTS task (id INTEGER PRIMARY KEY)')
+        conn.execute('CREATE TABLE IF NOT EXISTS item (name TEXT)')
+        conn.execute('DELETE FROM item')
+        conn.executemany('INSERT INTO item VALUES (?)', [(row,) for row in rows])
+        conn.commit()
+
+
+def read_database(path: str) -> list[str]:
+    with closing(sqlite3.connect(path)) as conn:
+        return [row[0] for row in conn.execute('SELECT name FROM item ORDER BY name')]
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    path = str(tmp_path / 'database.bin')
+    create_database(path, ['jefferson', 'kaelly'])
+
+    monkeypatch.setenv('ADMIN_TOKEN', ADMIN_TOKEN)
+    monkeypatch.setattr(main, 'database_path', lambda: path)
+
+    return path
+
+
+# =============================================== Snapshot and restore =================================================
+
+def test_snapshot_and_restore_database(tmp_path):
+    source = str(tmp_path / 'source.bin')
+    snapshot = str(tmp_path / 'snapshot.bin')
+
+    create_database(source, [f'item {i}' for i in range(5000)])
+    snapshot_database(source, snapshot)
+
+    create_database(source, ['changed'])
+    restore_database(snapshot, source)
+
+    assert len(read_database(source)) == 5000
+
+
+def write_items(path: str, started, stop):
+    with closing(sqlite3.connect(path)) as conn:
+        while not stop.is_set():
+            conn.execute('INSERT INTO item VALUES (?)', ('written',))
+            conn.commit()
+            started.set()
+
+
+def test_snapshot_database_while_writing(tmp_path):
+    """
+        Com a API escrevendo por outra conexão, a cópia deve terminar e o 'writer' não deve ser bloqueado.
+    """
+    source = str(tmp_path / 'source.bin')
+    snapshot = str(tmp_path / 'snapshot.bin')
+
+    create_database(source, [f'item {i} ' * 20 for i in range(200000)])
+
+    with closing(sqlite3.connect(source)) as conn:
+        conn.execute('PRAGMA journal_mode=WAL')
+
+    started, stop = Event(), Event()
+    writer = Process(target=write_items, args=(source, started, stop))
+    writer.start()
+
+    try:
+        assert started.wait(timeout=10)
+
+        snapshotting = threading.Thread(target=snapshot_database, args=(source, snapshot), daemon=True)
+        snapshotting.start()
+        snapshotting.join(timeout=10)
+
+        assert not snapshotting.is_alive()
+        assert writer.is_alive()
+
+    finally:
+        stop.set()
+        writer.join()
+
+    assert writer.exitcode == 0
+    assert len(read_database(snapshot)) >= 200000
+
+
+def test_restore_invalid_snapshot_exception(tmp_path):
+    source = str(tmp_path / 'source.bin')
+    snapshot = tmp_path / 'snapshot.bin'
+
+    create_database(source, ['jefferson'])
+    snapshot.write_bytes(b'not a database' * 100)
+
+    with pytest.raises(ValueError):
+        restore_database(str(snapshot), source)
+
+    assert read_database(source) == ['jefferson']
+
+
+def test_restore_snapshot_without_tables_exception(tmp_path):
+    source = str(tmp_path / 'source.bin')
+    snapshot = tmp_path / 'snapshot.bin'
+
+    create_database(source, ['jefferson'])
+    snapshot.write_bytes(b'')
+
+    with pytest.raises(ValueError):
+        restore_database(str(snapshot), source)
+
+    assert read_database(source) == ['jefferson']
+
+
+# ============================================ Test of /admin/snapshot ================================================
+
+@pytest.mark.anyio
+async def test_admin_routes_disabled_exception(client: AsyncClient, monkeypatch):
+    monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+
+    response = await client.get('/admin/snapshot', headers={'X-Admin-Token': ADMIN_TOKEN})
+
+    assert response.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_admin_snapshot_in_memory_database_exception(client: AsyncClient, monkeypatch):
+    monkeypatch.setenv('ADMIN_TOKEN', ADMIN_TOKEN)
+
+    response = await client.get('/admin/snapshot', headers={'X-Admin-Token': ADMIN_TOKEN})
+
+    assert response.status_code == 409
+
+
+@pytest.mark.anyio
+async def test_admin_snapshot_without_authorization_exception(client: AsyncClient, database):
+    response = await client.get('/admin/snapshot', headers={'X-Admin-Token': 'invalid'})
+
+    assert response.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_admin_snapshot_and_restore_success(client: AsyncClient, database):
+    headers = {'X-Admin-Token': ADMIN_TOKEN}
+
+    snapshot = await client.get('/admin/snapshot', headers=headers)
+
+    assert snapshot.status_code == 200
+
+    create_database(database, ['changed'])
+
+    response = await client.post('/admin/restore', headers=headers, content=snapshot.content)
+
+    assert response.status_code == 200
+    assert read_database(database) == ['jefferson', 'kaelly']
+
+
+# ============================================= Test of /admin/restore ================================================
+
+@pytest.mark.anyio
+async def test_admin_restore_invalid_snapshot_exception(client: AsyncClient, database):
+    headers = {'X-Admin-Token': ADMIN_TOKEN}
+
+    response = await client.post('/admin/restore', headers=headers, content=gzip.compress(b'not a database'))
+
+    assert response.status_code == 422
+    assert read_database(database) == ['jefferson', 'kaelly']
+
+
+@pytest.mark.anyio
+async def test_admin_restore_empty_snapshot_exception(client: AsyncClient, database):
+    headers = {'X-Admin-Token': ADMIN_TOKEN}
+
+    response = await client.post('/admin/restore', headers=headers, content=gzip.compress(b''))
+
+    assert response.status_code == 422
+    assert read_database(database) == ['jefferson', 'kaelly']
@@ -0,0 +1,61 @@
+import pytest
+from httpx import AsyncClient
+
+from jobs import job_handler, job_queue, fail_interrupted_jobs
+from models import Job, JobStatusEnum
+from testes.helpers import cls_db, wait_job
+
+
+@job_handler('test.fail')
+async def failing_job(report, message: str) -> str:
+    raise RuntimeError(message)
+
+
+@job_handler('test.echo')
+async def echo_job(report, message: str) -> str:
+    await report(1, 1)
+    return message
+
+
+# ==================================================== JobQueue ========================================================
+
+@pytest.mark.anyio
+async def test_job_handler_exception_marks_job_failed(client: AsyncClient):
+    await cls_db()
+
+    job = await job_queue.submit('test.fail', message='Something went wrong')
+    job = await wait_job(client, job.reference)
+
+    assert job['status'] == 'failed'
+    assert 'Something went wrong' in job['detail']
+
+
+@pytest.mark.anyio
+async def test_job_queue_survives_missing_job(client: AsyncClient):
+    await cls_db()
+
+    job = await job_queue.submit('test.echo', message='first')
+    await job.delete()
+    job = await job_queue.submit('test.echo', message='second')
+
+    assert (await wait_job(client, job.reference))['detail'] == 'second'
+    assert all(not task.done() for task in job_queue._tasks)
+
+
+@pytest.mark.anyio
+async def test_fail_interrupted_jobs():
+    await cls_db()
+
+    for status in JobStatusEnum:
+        await Job.create(reference=status.value, kind='test.echo', status=status)
+
+    await fail_interrupted_jobs()
+
+    statuses = {job.reference: job.status for job in await Job.all()}
+
+    assert statuses == {
+        'queued': JobStatusEnum.FAILED,
+        'running': JobStatusEnum.FAILED,
+        'completed': JobStatusEnum.COMPLETED,
+        'failed': JobStatusEnum.FAILED
+    }
@@ -0,0 +1,180 @@
+"""
+    Testes com volume de dados realista, gerado por <seed.py>. Cada rota é medida num 'dataset' inicial e de novo
+depois dele crescer SCALE_GROWTH vezes: o tempo deve ficar estável e as consultas que a rota executou devem usar
+índices. O tamanho pode ser ajustado pelas variáveis de ambiente, por exemplo para rodar com milhões de tarefas:
+
+    SCALE_USERS=1000 SCALE_TASKS_PER_USER=100 SCALE_GROWTH=10 python -m pytest testes/test_scale.py
+"""
+import logging
+from contextlib import contextmanager
+from os import environ
+from statistics import median
+from time import perf_counter
+from typing import NamedTuple
+
+import pytest
+from httpx import AsyncClient
+from tortoise import Tortoise
+
+from models import User, Task
+from seed import seed
+from testes.helpers import cls_db, wait_job
+
+SCALE_USERS = int(environ.get('SCALE_USERS', 200))
+SCALE_TASKS_PER_USER = int(environ.get('SCALE_TASKS_PER_USER', 50))
+SCALE_GROWTH = int(environ.get('SCALE_GROWTH', 10))
+SCALE_REPEATS = int(environ.get('SCALE_REPEATS', 7))
+SCALE_MAX_SLOWDOWN = float(environ.get('SCALE_MAX_SLOWDOWN', 3.0))
+
+
+class Measurement(NamedTuple):
+    seconds: float
+    queries: list[tuple[str, list]]
+
+
+class QueryCapture(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.queries = list()
+
+    def emit(self, record: logging.LogRecord):
+        query, values = record.args if len(record.args) == 2 else (record.msg, [])
+
+        if query.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+            self.queries.append((query, list(values or [])))
+
+
+@contextmanager
+def captured_queries():
+    """
+        Captura o SQL executado pelo Tortoise, através do 'log' de 'debug' do cliente do banco de dados.
+    """
+    logger = logging.getLogger('tortoise.db_client')
+    handler = QueryCapture()
+    level = logger.level
+
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+
+    try:
+        yield handler.queries
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+
+
+async def query_plan(query: str, values: list) -> list[str]:
+    _, rows = await Tortoise.get_connection('default').execute_query(f'EXPLAIN QUERY PLAN {query}', values)
+    return [row['detail'] for row in rows]
+
+
+# ================================================== Operations ========================================================
+
+async def list_tasks(client: AsyncClient, user: User):
+    response = await client.get(f'/task/list/{user.reference}')
+
+    assert response.status_code == 200
+    assert len(response.json()) == SCALE_TASKS_PER_USER
+
+
+async def update_task(client: AsyncClient, user: User):
+    task = await Task.filter(user=user).first()
+
+    response = await client.put('/task/update', json={
+        'user_reference': user.reference,
+        'task_reference': task.reference,
+        'token': user.current_access_token,
+        'target': 'status',
+        'value': 'completed'
+    })
+
+    assert response.status_code == 200
+
+
+async def delete_task(client: AsyncClient, user: User):
+    task = await Task.filter(user=user).first()
+
+    response = await client.delete(f'/task/delete/{user.reference}/{task.reference}')
+
+    assert response.status_code == 200
+
+
+async def clear_all_tasks(client: AsyncClient, user: User):
+    response = await client.delete(f'/task/clear/{user.reference}')
+    job = await wait_job(client, response.json()['job'])
+
+    assert job['status'] == 'completed'
+    assert not await Task.filter(user=user).exists()
+
+
+OPERATIONS = {
+    'list_tasks': list_tasks,
+    'update_task': update_task,
+    'delete_task': delete_task,
+    'clear_all_tasks': clear_all_tasks,
+}
+
+
+async def measure(client: AsyncClient, first_user_id: int) -> dict[str, Measurement]:
+    """
+        Mede cada operação em SCALE_REPEATS usuários ainda intactos, a partir de <first_user_id>, e guarda o SQL
+    que ela executou.
+    """
+    measurements = dict()
+
+    for index, (name, operation) in enumerate(OPERATIONS.items()):
+        start_id = first_user_id + index * SCALE_REPEATS
+        users = await User.filter(id__gte=start_id, id__lt=start_id + SCALE_REPEATS).order_by('id')
+        times = list()
+
+        with captured_queries() as queries:
+            for user in users:
+                start = perf_counter()
+                await operation(client, user)
+                times.append(perf_counter() - start)
+
+        measurements[name] = Measurement(median(times), queries)
+
+    return measurements
+
+
+@pytest.fixture(scope='module')
+async def measurements(client: AsyncClient):
+    assert SCALE_USERS >= len(OPERATIONS) * SCALE_REPEATS
+
+    await cls_db()
+
+    first_id, _ = await seed(SCALE_USERS, SCALE_TASKS_PER_USER)
+    small = await measure(client, first_id)
+
+    first_id, _ = await seed(SCALE_USERS * (SCALE_GROWTH - 1), SCALE_TASKS_PER_USER)
+    large = await measure(client, first_id)
+
+    yield small, large
+
+    await cls_db()
+
+
+# ==================================================== Tests ===========================================================
+
+@pytest.mark.anyio
+@pytest.mark.parametrize('operation', OPERATIONS)
+async def test_scale_queries_use_indexes(measurements, operation: str):
+    _, large = measurements
+
+    assert large[operation].queries
+
+    for query, values in large[operation].queries:
+        plan = await query_plan(query, values)
+
+        assert not any(detail.startswith('SCAN') for detail in plan), f'{query}: {plan}'
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize('operation', OPERATIONS)
+async def test_scale_time_stays_flat(measurements, operation: str):
+    small, large = measurements
+
+    assert large[operation].seconds <= small[operation].seconds * SCALE_MAX_SLOWDOWN, \
+        f'{operation}: {small[operation].seconds:.4f}s -> {large[operation].seconds:.4f}s ' \
+        f'after growing the dataset {SCALE_GROWTH}x'
@@ -1,8 +1,16 @@
+from asyncio import sleep
 from json import load
+from os import environ
+from secrets import compare_digest
+from typing import Awaitable, Callable
 
 from starlette.exceptions import HTTPException
+from tortoise import Tortoise
 from models import *
 
+CLEAR_CHUNK_SIZE = 500
+CLEAR_CHUNK_PAUSE = 0.005
+
 
 async def user_not_found_exception(reference: str):
     if not await User.filter(reference=reference).exists():
@@ -29,6 +37,54 @@ async def compare_access_token(token: str, reference: str):
         raise HTTPException(status_code=401, detail='The access token is not valid. Unauthorized access!')
 
 
+async def delete_tasks_in_chunks(
+        user: User,
+        chunk_size: int = CLEAR_CHUNK_SIZE,
+        pause: float = CLEAR_CHUNK_PAUSE,
+        on_chunk: Callable[[int], Awaitable[None]] = None
+) -> int:
+    """
+        Deleta todas as tarefas de um usuário em lotes de no máximo <chunk_size>, cedendo o 'event loop' entre um
+    lote e outro. Assim o 'lock' de escrita do SQLite é liberado a cada lote e outras escritas não ficam paradas
+    durante uma limpeza grande.
+
+    :param on_chunk: Opcional, é chamado após cada lote com o total já deletado (usado para reportar progresso).
+
+    :return: Quantidade de tarefas deletadas.
+    """
+    deleted = 0
+
+    while True:
+        ids = await Task.filter(user=user).order_by('id').limit(chunk_size).values_list('id', flat=True)
+
+        if not ids:
+            return deleted
+
+        deleted += await Task.filter(id__in=ids).delete()
+
+        if on_chunk:
+            await on_chunk(deleted)
+
+        await sleep(pause)
+
+
+def compare_admin_token(token: str | None):
+    """
+        As rotas de administração só ficam disponíveis quando a variável de ambiente ADMIN_TOKEN está definida.
+    """
+    admin_token = environ.get('ADMIN_TOKEN')
+
+    if not admin_token:
+        raise HTTPException(status_code=403, detail='Admin routes are disabled. Set ADMIN_TOKEN to enable them.')
+
+    if not token or not compare_digest(token, admin_token):
+        raise HTTPException(status_code=401, detail='The admin token is not valid. Unauthorized access!')
+
+
+def database_path() -> str:
+    return Tortoise.get_connection('default').filename
+
+
 def get_test_data(pk: str = None):
     with open('testes/test_data.json', 'r', encoding='utf-8') as file:
         if pk: